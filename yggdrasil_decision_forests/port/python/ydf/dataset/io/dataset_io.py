@@ -14,9 +14,8 @@
 
 """Common functionality for all dataset I/O connectors."""
 
-import math
 import re
-from typing import Iterator, Optional, Sequence, Tuple
+from typing import AbstractSet, Callable, Collection, Dict, Iterator, Optional, Sequence, Tuple
 
 import numpy as np
 
@@ -39,14 +38,13 @@ def unrolled_feature_names(name: str, num_dims: int) -> Sequence[str]:
   #   num_features=1 => num_leading_zeroes = 1
   #   num_features=9 => num_leading_zeroes = 1
   #   num_features=10 => num_leading_zeroes = 2
-  num_leading_zeroes = int(math.log10(num_dims)) + 1
+  num_leading_zeroes = len(str(num_dims))
 
-  postfix = f"_of_{num_dims:0{num_leading_zeroes}}"
+  # The format template is parsed once instead of once per dimension. Note
+  # that "name" is passed as an argument since it may contain braces.
+  template = f"{{}}.{{:0{num_leading_zeroes}}}_of_{num_dims}".format
 
-  return [
-      f"{name}.{dim_idx:0{num_leading_zeroes}}{postfix}"
-      for dim_idx in range(num_dims)
-  ]
+  return [template(name, dim_idx) for dim_idx in range(num_dims)]
 
 
 def parse_unrolled_feature_name(name: str) -> Optional[Tuple[str, int, int]]:
@@ -60,27 +58,25 @@ def parse_unrolled_feature_name(name: str) -> Optional[Tuple[str, int, int]]:
 
 
 def _unroll_column(
-    name: str, src: dataset_io_types.InputValues, allow_unroll: bool
-) -> Iterator[Tuple[str, dataset_io_types.InputValues, bool]]:
-  """Unrolls a possibly multi-dim. column into multiple single-dim columns.
+    name: str, src: np.ndarray, allow_unroll: bool
+) -> Iterator[Tuple[str, np.ndarray]]:
+  """Unrolls a multi-dim. column into multiple single-dim columns.
 
-  Yield the results. If the "src" column is not multi-dimensional, yields "src"
-  directly. Fails if "src" contains more than two dimensions.
+  Yield the results. Fails if "src" contains more than two dimensions.
+
+  The unrolled columns are strided views (i.e., no copy) of "src".
 
   Args:
     name: Name of the source column.
-    src: Single-dimensional or multi-dimensional value.
-    allow_unroll: If false, fails if the column should be unrolled.
+    src: Multi-dimensional value i.e. a numpy array with at least two
+      dimensions.
+    allow_unroll: If false, fails as the column is not allowed to be unrolled.
 
   Yields:
-    Tuple of key and values of single-dimentional features, and boolean
-    indicating if the feature is unrolled.
+    Tuple of key and values of single-dimentional features.
   """
 
-  # Numpy is currently the only way to pass multi-dim features.
-  if not isinstance(src, np.ndarray) or src.ndim <= 1:
-    yield name, src, False
-    return
+  assert src.ndim > 1
 
   if not allow_unroll:
     raise ValueError(
@@ -101,13 +97,20 @@ def _unroll_column(
 
   sub_names = unrolled_feature_names(name, num_features)
   for dim_idx, sub_name in enumerate(sub_names):
-    yield sub_name, src[:, dim_idx], True
+    yield sub_name, src[:, dim_idx]
+
+
+def _as_set(values: Collection[str]) -> AbstractSet[str]:
+  """Returns "values" as a set. Sets are returned as is."""
+  if isinstance(values, (set, frozenset)):
+    return values
+  return frozenset(values)
 
 
 def _unroll_dict(
     src: dataset_io_types.DictInputValues,
-    single_dim_columns: Sequence[str],
-    not_unrolled_multi_dim_columns: Sequence[str],
+    single_dim_columns: Collection[str],
+    not_unrolled_multi_dim_columns: Collection[str],
 ) -> Tuple[
     dataset_io_types.DictInputValues, dataset_io_types.UnrolledFeaturesInfo
 ]:
@@ -124,9 +127,21 @@ def _unroll_dict(
     Dictionary containing only single-dimensional values.
   """
 
+  # Note: "isinstance" and "np.ndarray" are bound to local variables to save a
+  # global and an attribute lookup for each column.
+  is_instance = isinstance
+  ndarray = np.ndarray
+
+  # Fast path: Numpy is currently the only way to pass multi-dim features. If
+  # there are none, no column needs to be unrolled.
+  if not any(
+      is_instance(value, ndarray) and value.ndim > 1 for value in src.values()
+  ):
+    return dict(src), {}
+
   # Index the columns for fast query.
-  single_dim_columns_set = set(single_dim_columns)
-  not_unrolled_multi_dim_columns_set = set(not_unrolled_multi_dim_columns)
+  single_dim_columns_set = _as_set(single_dim_columns)
+  not_unrolled_multi_dim_columns_set = _as_set(not_unrolled_multi_dim_columns)
 
   unrolled_features_info = {}
 
@@ -134,30 +149,89 @@ def _unroll_dict(
   # features.
   dst = {}
   for name, value in src.items():
-    if name in not_unrolled_multi_dim_columns_set:
+    if (
+        not is_instance(value, ndarray)
+        or value.ndim <= 1
+        or name in not_unrolled_multi_dim_columns_set
+    ):
+      # Single-dimensional columns are passed through without going through
+      # the "_unroll_column" generator.
       dst[name] = value
       continue
 
-    any_is_unrolling = False
     sub_dst = {}
-    for sub_name, sub_value, is_unrolling in _unroll_column(
+    for sub_name, sub_value in _unroll_column(
         name, value, allow_unroll=name not in single_dim_columns_set
     ):
       sub_dst[sub_name] = sub_value
-      any_is_unrolling |= is_unrolling
 
     dst.update(sub_dst)
-
-    if any_is_unrolling:
-      unrolled_features_info[name] = list(sub_dst.keys())
+    unrolled_features_info[name] = list(sub_dst.keys())
 
   return dst, unrolled_features_info
 
 
+# Converts a dataset into a dictionary of values.
+_ToDictFn = Callable[
+    [dataset_io_types.IODataset], dataset_io_types.DictInputValues
+]
+
+
+def _dict_to_dict(
+    data: dataset_io_types.IODataset,
+) -> dataset_io_types.DictInputValues:
+  """Dictionary of values. Returns the dictionary as is."""
+  assert isinstance(data, dict)
+  return data
+
+
+# Dataset connectors, in order of priority, as (is_supported, to_dict) pairs.
+_TO_DICT_CONNECTORS: Sequence[
+    Tuple[Callable[[dataset_io_types.IODataset], bool], _ToDictFn]
+] = (
+    (pandas_io.is_pandas_dataframe, pandas_io.to_dict),
+    (polars_io.is_polars_dataframe, polars_io.to_dict),
+    (xarray_io.is_xarray_dataset, xarray_io.to_dict),
+    (tensorflow_io.is_tensorflow_dataset, tensorflow_io.to_dict),
+    (pygrain_io.is_pygrain, pygrain_io.to_dict),
+    (lambda data: isinstance(data, dict), _dict_to_dict),
+)
+
+# "to_dict" function of the connector to use for a given dataset type.
+# Populated lazily by "_get_to_dict_fn" so that the optional dependencies (e.g.
+# Pandas, TensorFlow) are never imported by YDF itself.
+_TO_DICT_FN_BY_TYPE: Dict[type, _ToDictFn] = {dict: _dict_to_dict}
+
+
+def _get_to_dict_fn(data: dataset_io_types.IODataset) -> Optional[_ToDictFn]:
+  """Gets the "to_dict" function to normalize a dataset, if supported.
+
+  The connectors are only probed the first time a given dataset type is seen.
+
+  Args:
+    data: Input data.
+
+  Returns:
+    The "to_dict" function of the connector, or None if the dataset type is not
+    supported.
+  """
+
+  data_type = type(data)
+  to_dict_fn = _TO_DICT_FN_BY_TYPE.get(data_type)
+  if to_dict_fn is not None:
+    return to_dict_fn
+
+  for is_supported, to_dict_fn in _TO_DICT_CONNECTORS:
+    if is_supported(data):
+      _TO_DICT_FN_BY_TYPE[data_type] = to_dict_fn
+      return to_dict_fn
+  return None
+
+
 def cast_input_dataset_to_dict(
     data: dataset_io_types.IODataset,
-    single_dim_columns: Optional[Sequence[str]] = None,
-    not_unrolled_multi_dim_columns: Optional[Sequence[str]] = None,
+    single_dim_columns: Optional[Collection[str]] = None,
+    not_unrolled_multi_dim_columns: Optional[Collection[str]] = None,
 ) -> Tuple[
     dataset_io_types.DictInputValues, dataset_io_types.UnrolledFeaturesInfo
 ]:
@@ -167,35 +241,28 @@ def cast_input_dataset_to_dict(
 
   Args:
     data: Input data.
-    single_dim_columns: Optional list of columns that should be
+    single_dim_columns: Optional list or set of columns that should be
       single-dimensional. If one such column is multi-dimensional, raise an
       error.
-    not_unrolled_multi_dim_columns: Optional list of columns that should be
-      multi-dimensional and not unrolled.
+    not_unrolled_multi_dim_columns: Optional list or set of columns that
+      should be multi-dimensional and not unrolled.
 
   Returns:
     The normalized features, and information about unrolled features.
   """
 
+  # Note: The column lists are only indexed if some columns are unrolled.
+  # Callers that import many datasets can pass sets to avoid this indexing.
   unroll_dict_kwargs = {
-      "single_dim_columns": single_dim_columns or [],
-      "not_unrolled_multi_dim_columns": not_unrolled_multi_dim_columns or [],
+      "single_dim_columns": single_dim_columns or frozenset(),
+      "not_unrolled_multi_dim_columns": (
+          not_unrolled_multi_dim_columns or frozenset()
+      ),
   }
 
-  if pandas_io.is_pandas_dataframe(data):
-    return _unroll_dict(pandas_io.to_dict(data), **unroll_dict_kwargs)
-  elif polars_io.is_polars_dataframe(data):
-    return _unroll_dict(polars_io.to_dict(data), **unroll_dict_kwargs)
-  elif xarray_io.is_xarray_dataset(data):
-    return _unroll_dict(xarray_io.to_dict(data), **unroll_dict_kwargs)
-  elif tensorflow_io.is_tensorflow_dataset(data):
-    return _unroll_dict(tensorflow_io.to_dict(data), **unroll_dict_kwargs)
-  elif pygrain_io.is_pygrain(data):
-    return _unroll_dict(pygrain_io.to_dict(data), **unroll_dict_kwargs)
-
-  elif isinstance(data, dict):
-    # Dictionary of values
-    return _unroll_dict(data, **unroll_dict_kwargs)
+  to_dict_fn = _get_to_dict_fn(data)
+  if to_dict_fn is not None:
+    return _unroll_dict(to_dict_fn(data), **unroll_dict_kwargs)
 
   # TODO: Maybe this error should be raised at a layer above this one?
 
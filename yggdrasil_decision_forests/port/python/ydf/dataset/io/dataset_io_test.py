@@ -12,8 +12,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+
 from absl.testing import absltest
 from absl.testing import parameterized
+import numpy as np
 from ydf.dataset.io import dataset_io
 
 
@@ -31,6 +34,13 @@ class DatasetIoTest(parameterized.TestCase):
         ],
     )
 
+  def test_unrolled_feature_names_with_leading_zeroes_and_braces(self):
+    names = dataset_io.unrolled_feature_names("a{b}", 100)
+    self.assertLen(names, 100)
+    self.assertEqual(names[0], "a{b}.000_of_100")
+    self.assertEqual(names[42], "a{b}.042_of_100")
+    self.assertEqual(names[99], "a{b}.099_of_100")
+
   def test_unrolled_feature_names_with_zero_dim(self):
     with self.assertRaisesRegex(ValueError, "should be strictly positive"):
       dataset_io.unrolled_feature_names("a", 0)
@@ -55,6 +65,58 @@ class DatasetIoTest(parameterized.TestCase):
   def test_parse_unrolled_feature_name_is_none(self, name):
     self.assertIsNone(dataset_io.parse_unrolled_feature_name(name))
 
+  def test_cast_input_dataset_to_dict_unrolls_columns(self):
+    data = {"a": np.array([[1, 2, 3], [4, 5, 6]]), "b": np.array([7, 8])}
+    values, unrolled_info = dataset_io.cast_input_dataset_to_dict(data)
+    self.assertEqual(
+        list(values), ["a.0_of_3", "a.1_of_3", "a.2_of_3", "b"]
+    )
+    np.testing.assert_array_equal(values["a.0_of_3"], [1, 4])
+    np.testing.assert_array_equal(values["a.1_of_3"], [2, 5])
+    np.testing.assert_array_equal(values["a.2_of_3"], [3, 6])
+    np.testing.assert_array_equal(values["b"], [7, 8])
+    self.assertEqual(
+        unrolled_info, {"a": ["a.0_of_3", "a.1_of_3", "a.2_of_3"]}
+    )
+
+  def test_cast_input_dataset_to_dict_without_multi_dim_columns(self):
+    data = {"a": np.array([1, 2]), "b": ["x", "y"]}
+    values, unrolled_info = dataset_io.cast_input_dataset_to_dict(
+        data, single_dim_columns=["a"]
+    )
+    self.assertIsNot(values, data)
+    self.assertEqual(list(values), ["a", "b"])
+    self.assertIs(values["a"], data["a"])
+    self.assertIs(values["b"], data["b"])
+    self.assertEqual(unrolled_info, {})
+
+  def test_cast_input_dataset_to_dict_single_dim_column_is_multi_dim(self):
+    with self.assertRaisesRegex(ValueError, "is multi-dimensional"):
+      dataset_io.cast_input_dataset_to_dict(
+          {"a": np.array([[1, 2], [3, 4]])}, single_dim_columns=["a"]
+      )
+
+  def test_cast_input_dataset_to_dict_with_column_sets(self):
+    data = {"a": np.array([[1, 2], [3, 4]]), "b": np.array([[5, 6], [7, 8]])}
+    values, unrolled_info = dataset_io.cast_input_dataset_to_dict(
+        data, not_unrolled_multi_dim_columns=frozenset(["b"])
+    )
+    self.assertEqual(list(values), ["a.0_of_2", "a.1_of_2", "b"])
+    self.assertIs(values["b"], data["b"])
+    self.assertEqual(unrolled_info, {"a": ["a.0_of_2", "a.1_of_2"]})
+
+  def test_cast_input_dataset_to_dict_with_dict_subclass(self):
+    data = collections.OrderedDict(a=np.array([1, 2]))
+    # The second call uses the cached connector of the dataset type.
+    for _ in range(2):
+      values, _ = dataset_io.cast_input_dataset_to_dict(data)
+      self.assertEqual(list(values), ["a"])
+      np.testing.assert_array_equal(values["a"], [1, 2])
+
+  def test_cast_input_dataset_to_dict_unsupported_type(self):
+    with self.assertRaisesRegex(ValueError, "Unsupported dataset type"):
+      dataset_io.cast_input_dataset_to_dict([1, 2, 3])
+
 
 if __name__ == "__main__":
   absltest.main()
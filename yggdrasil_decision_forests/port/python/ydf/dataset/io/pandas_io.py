@@ -53,21 +53,30 @@ def to_dict(
   assert isinstance(data, pd.DataFrame)
   if data.ndim != 2:
     raise ValueError("The pandas DataFrame must be two-dimensional.")
-  data_dict = data.to_dict("series")
 
-  for k in data_dict:
+  for k in data.columns:
     if not isinstance(k, str):
       raise ValueError("The pandas DataFrame must have string column names.")
 
+  if not data.columns.is_unique:
+    logging.warning(
+        "The pandas DataFrame columns are not unique, only the last column"
+        " with a given name is used."
+    )
+
   def clean(values):
-    if values.dtype == "object":
+    dtype = values.dtype
+    # Note: Comparing the dtype to a string (e.g. dtype == "object") parses the
+    # string for each column. Extension dtypes (e.g. categorical, nullable
+    # integers) are not numpy dtypes and are never "object".
+    if isinstance(dtype, np.dtype) and dtype.kind == "O":
       return values.to_numpy(copy=False, na_value="")
     else:
       return values.to_numpy(copy=False)
 
-  data_dict = {k: clean(v) for k, v in data_dict.items()}
-
-  return data_dict
+  # Note: The numpy arrays are extracted column by column instead of going
+  # through an intermediate "DataFrame.to_dict" dictionary of series.
+  return {k: clean(v) for k, v in data.items()}
 
 
 class PandasBatchedExampleGenerator(generator_lib.BatchedExampleGenerator):
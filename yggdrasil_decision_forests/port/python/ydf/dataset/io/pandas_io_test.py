@@ -15,6 +15,7 @@
 """Test dataspec utilities for pandas."""
 
 from absl.testing import absltest
+import numpy as np
 import pandas as pd
 import polars as pl
 
@@ -35,6 +36,40 @@ class PandasIOTest(absltest.TestCase):
   def test_polars_is_not_pandas(self):
     self.assertFalse(pandas_io.is_pandas_dataframe(pl.DataFrame()))
 
+  def test_to_dict(self):
+    df = pd.DataFrame(
+        {"a": [1, 2], "b": pd.Series(["x", None], dtype=object)}
+    )
+    data_dict = pandas_io.to_dict(df)
+    self.assertEqual(list(data_dict), ["a", "b"])
+    np.testing.assert_array_equal(data_dict["a"], np.array([1, 2]))
+    np.testing.assert_array_equal(
+        data_dict["b"], np.array(["x", ""], dtype=object)
+    )
+
+  def test_to_dict_extension_dtypes(self):
+    df = pd.DataFrame({
+        "a": pd.Series([1, 2], dtype="Int64"),
+        "b": pd.Series(["x", "y"], dtype="category"),
+    })
+    data_dict = pandas_io.to_dict(df)
+    np.testing.assert_array_equal(data_dict["a"], np.array([1, 2]))
+    np.testing.assert_array_equal(
+        data_dict["b"], np.array(["x", "y"], dtype=object)
+    )
+
+  def test_to_dict_duplicate_column_names(self):
+    df = pd.DataFrame([[1, 2]], columns=["a", "a"])
+    with self.assertLogs(level="WARNING") as logs:
+      data_dict = pandas_io.to_dict(df)
+    self.assertIn("columns are not unique", logs.output[0])
+    self.assertEqual(list(data_dict), ["a"])
+    np.testing.assert_array_equal(data_dict["a"], np.array([2]))
+
+  def test_to_dict_non_string_column_names(self):
+    with self.assertRaisesRegex(ValueError, "must have string column names"):
+      pandas_io.to_dict(pd.DataFrame({1: [1, 2]}))
+
   def test_pandas_generator(self):
     ds = pandas_io.PandasBatchedExampleGenerator(self.adult.train_pd)
     self.assertEqual(ds.num_batches(100), 228)
@@ -51,5 +51,12 @@ def to_dict(
 ) -> Dict[str, dataset_io_types.InputValues]:
   """Converts a Tensorflow dataset to a dict of numpy arrays."""
   assert hasattr(data, "rebatch")
-  full_batch = next(iter(data.rebatch(sys.maxsize)))
+  full_dataset = data.rebatch(sys.maxsize)
+  if hasattr(full_dataset, "get_single_element"):
+    # Note: "get_single_element" runs the whole input pipeline in a single op
+    # instead of going through a Python iterator.
+    full_batch = full_dataset.get_single_element()
+  else:
+    # TensorFlow < 2.6.
+    full_batch = next(iter(full_dataset))
   return {k: v.numpy() for k, v in full_batch.items()}
@@ -12,7 +12,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import json
+import math
+import sys
+import unittest
+
 from absl.testing import absltest
+import numpy as np
 from yggdrasil_decision_forests.model.decision_tree import decision_tree_pb2
 from ydf.model.tree import value as value_lib
 from ydf.utils import test_utils
@@ -34,6 +40,19 @@ class ValueTest(absltest.TestCase):
         value_lib.ProbabilityValue(probability=[0.8, 0.2], num_examples=10),
     )
 
+  def test_to_value_classifier_without_examples(self):
+    proto_node = decision_tree_pb2.Node(
+        classifier=decision_tree_pb2.NodeClassifierOutput(
+            distribution=distribution_pb2.IntegerDistributionDouble(
+                counts=[0.0, 0.0, 0.0], sum=0.0
+            )
+        )
+    )
+    value = value_lib.to_value(proto_node)
+    self.assertEqual(value.num_examples, 0.0)
+    self.assertLen(value.probability, 2)
+    self.assertTrue(all(math.isnan(p) for p in value.probability))
+
   def test_to_value_regressor_given_valid_input(self):
     proto_node = decision_tree_pb2.Node(
         regressor=decision_tree_pb2.NodeRegressorOutput(
@@ -63,6 +82,115 @@ class ValueTest(absltest.TestCase):
         ),
     )
 
+  def test_to_value_anomaly_detection_given_valid_input(self):
+    proto_node = decision_tree_pb2.Node(
+        anomaly_detection=decision_tree_pb2.NodeAnomalyDetectionOutput(
+            num_examples_without_weight=5
+        )
+    )
+    self.assertEqual(
+        value_lib.to_value(proto_node),
+        value_lib.AnomalyDetectionValue(
+            num_examples_without_weight=5, num_examples=-1.0
+        ),
+    )
+
+  def test_to_value_without_output(self):
+    with self.assertRaisesRegex(ValueError, "Unsupported value"):
+      value_lib.to_value(decision_tree_pb2.Node())
+
+  def test_to_value_classifier_is_json_serializable(self):
+    value = value_lib.to_value(
+        decision_tree_pb2.Node(
+            classifier=decision_tree_pb2.NodeClassifierOutput(
+                distribution=distribution_pb2.IntegerDistributionDouble(
+                    counts=[0.0, 8.0, 2.0], sum=10.0
+                )
+            )
+        )
+    )
+    self.assertIsInstance(value.probability, list)
+    self.assertEqual(
+        json.loads(json.dumps(value_lib.to_json(value))),
+        {"type": "PROBABILITY", "distribution": [0.8, 0.2], "num_examples": 10},
+    )
+
+  def test_to_value_arrays_regressor(self):
+    arrays = value_lib.to_value_arrays([
+        decision_tree_pb2.Node(
+            regressor=decision_tree_pb2.NodeRegressorOutput(
+                top_value=1,
+                distribution=distribution_pb2.NormalDistributionDouble(
+                    sum=10, sum_squares=20, count=10
+                ),
+            )
+        ),
+        decision_tree_pb2.Node(
+            regressor=decision_tree_pb2.NodeRegressorOutput(top_value=2)
+        ),
+    ])
+    np.testing.assert_array_equal(arrays.num_examples, [10.0, 0.0])
+    np.testing.assert_array_equal(arrays.value, [1.0, 2.0])
+    np.testing.assert_array_equal(arrays.standard_deviation, [1.0, np.nan])
+
+  def test_to_value_arrays_regressor_invalid_variances(self):
+    def regressor_node(sum_values, sum_squares, count):
+      return decision_tree_pb2.Node(
+          regressor=decision_tree_pb2.NodeRegressorOutput(
+              top_value=1,
+              distribution=distribution_pb2.NormalDistributionDouble(
+                  sum=sum_values, sum_squares=sum_squares, count=count
+              ),
+          )
+      )
+
+    with np.errstate(all="raise"):
+      arrays = value_lib.to_value_arrays([
+          regressor_node(10, 20, 10),
+          # Negative variance.
+          regressor_node(10, 5, 10),
+          # No examples.
+          regressor_node(0, 0, 0),
+          # Zero variance.
+          regressor_node(10, 10, 10),
+      ])
+    np.testing.assert_array_equal(
+        arrays.standard_deviation, [1.0, np.nan, np.nan, 0.0]
+    )
+
+  def test_to_value_arrays_classifier(self):
+    arrays = value_lib.to_value_arrays([
+        decision_tree_pb2.Node(
+            classifier=decision_tree_pb2.NodeClassifierOutput(
+                distribution=distribution_pb2.IntegerDistributionDouble(
+                    counts=[0.0, 8.0, 2.0], sum=10.0
+                )
+            )
+        ),
+        decision_tree_pb2.Node(
+            classifier=decision_tree_pb2.NodeClassifierOutput(
+                distribution=distribution_pb2.IntegerDistributionDouble(
+                    counts=[0.0, 1.0, 3.0], sum=4.0
+                )
+            )
+        ),
+    ])
+    np.testing.assert_array_equal(arrays.num_examples, [10.0, 4.0])
+    np.testing.assert_array_equal(
+        arrays.probability, [[0.8, 0.2], [0.25, 0.75]]
+    )
+
+  def test_to_value_arrays_mixed_nodes(self):
+    with self.assertRaisesRegex(ValueError, "should either all be"):
+      value_lib.to_value_arrays([
+          decision_tree_pb2.Node(
+              regressor=decision_tree_pb2.NodeRegressorOutput(top_value=1)
+          ),
+          decision_tree_pb2.Node(
+              uplift=decision_tree_pb2.NodeUpliftOutput(sum_weights=10)
+          ),
+      ])
+
   def test_classifier_proto_node_is_set_given_valid_input(self):
     proto_node = decision_tree_pb2.Node()
     value_lib.set_proto_node(
@@ -121,6 +249,17 @@ class ValueTest(absltest.TestCase):
         ),
     )
 
+  @unittest.skipIf(
+      sys.version_info < (3, 10), "Dataclass slots require Python 3.10"
+  )
+  def test_values_have_slots(self):
+    value = value_lib.RegressionValue(
+        value=1.0, num_examples=10, standard_deviation=1.0
+    )
+    self.assertFalse(hasattr(value, "__dict__"))
+    with self.assertRaises(AttributeError):
+      value.unknown_field = 1
+
   def test_pretty_classification(self):
     self.assertEqual(
         value_lib.ProbabilityValue(